@@ -1,45 +1,102 @@
+import asyncio
+import contextlib
+import io
 import logging
-import csv
-import os
-from datetime import datetime, timedelta
+import wave
+from collections import deque
+from collections.abc import AsyncIterator
 
 from dotenv import load_dotenv
+from google.cloud import texttospeech
+from livekit import rtc
 from livekit.agents import (
-    NOT_GIVEN,
     Agent,
-    AgentFalseInterruptionEvent,
     AgentSession,
     JobContext,
     JobProcess,
     MetricsCollectedEvent,
     RoomInputOptions,
-    RunContext,
     WorkerOptions,
     cli,
     metrics,
+    utils,
 )
-from livekit.agents.llm import function_tool
-from livekit.plugins import cartesia, deepgram, noise_cancellation, openai, silero
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
-from livekit.plugins import sarvam
-
-# Import helper functions from tools
-from tools.customer_lookup import _find_customers, _get_data_file_path as get_customer_data_path
-from tools.kyc_status_checker import _get_data_file_path as get_kyc_data_path
-from tools.phone_verification import _get_data_file_path as get_phone_data_path
-from tools.complaint_manager import _load_complaints, _save_complaints, _get_complaints_file_path
+# Plugins register themselves on import and must do so on the main thread, so
+# they stay at module level; only the ones the session actually uses are imported
+from livekit.plugins import deepgram, google, silero
+
+# Import tools
+from tools.customer_data import _load_index as load_customer_index
+from tools.customer_lookup import customer_lookup_tool, customer_lookup_by_opus_id_tool
+from tools.kyc_status_checker import kyc_status_checker_tool
+from tools.customer_profile import customer_full_profile_tool, identify_caller_tool, identify_and_check_kyc_tool
+from tools.phone_verification import verify_phone_number
+from tools.complaint_manager import auto_create_complaint_tool, create_complaint_tool, create_enquiry_tool
 from tools.hardcoded_context import hardcoded_context_tool, set_caller_context_tool
-from livekit.plugins import google
+
+try:
+    import uvloop
+except ImportError:  # uvloop doesn't support Windows
+    uvloop = None
 
 logger = logging.getLogger("agent")
 
 load_dotenv(".env.local")
 
+# The CLI and the job processes both create their loops with asyncio.new_event_loop(),
+# so setting the policy at import time covers the worker and every job
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+# Built once per process so every session shares the same tool objects
+_ASSISTANT_TOOLS = (
+    identify_caller_tool,
+    customer_full_profile_tool,
+    hardcoded_context_tool,
+    set_caller_context_tool,
+    customer_lookup_tool,
+    customer_lookup_by_opus_id_tool,
+    verify_phone_number,
+    kyc_status_checker_tool,
+    identify_and_check_kyc_tool,
+    auto_create_complaint_tool,
+    create_complaint_tool,
+    create_enquiry_tool,
+)
 
-class Assistant(Agent):
-    def __init__(self) -> None:
-        super().__init__(
-            instructions="""You are Anjali, a 23-year-old professional female customer care agent at Birla Opus specialized in KYC approval and account verification for painters and contractors.
+# Opening line from STEP 1 of the instructions; it never changes, so it is spoken
+# directly instead of asking the LLM to produce it on every call
+GREETING = "Namaste, welcome to Birla Opus. Mera naam Anjali hai, kaise sahayata kar sakti hun aapki?"
+
+# Voice used for both the live TTS stream and the pre-synthesized greeting
+TTS_VOICE = "hi-IN-Chirp3-HD-Achernar"
+TTS_LANGUAGE = "hi-IN"
+TTS_SAMPLE_RATE = 8000
+# Seconds prewarm() waits for the pre-synthesized greeting before falling back
+GREETING_SYNTHESIS_TIMEOUT = 3.0
+
+# Seconds between flushes of buffered pipeline metrics to the log
+METRICS_FLUSH_INTERVAL = 0.5
+
+# Turn-taking and interruption settings shared by every AgentSession in this worker
+_SESSION_KWARGS = {
+    "allow_interruptions": True,
+    "discard_audio_if_uninterruptible": True,
+    "min_interruption_duration": 0.05,
+    "min_interruption_words": 0,
+    "min_endpointing_delay": 0.05,
+    "max_endpointing_delay": 0.3,
+    "min_consecutive_speech_delay": 0.0,
+    "resume_false_interruption": False,
+    "user_away_timeout": 15.0,
+    "false_interruption_timeout": 2.0,
+    # start the LLM reply on the final transcript, before end-of-turn is confirmed
+    "preemptive_generation": True,
+}
+
+
+# Shared by every session instead of being rebuilt in each Assistant()
+_INSTRUCTIONS = """You are Anjali, a 23-year-old professional female customer care agent at Birla Opus specialized in KYC approval and account verification for painters and contractors.
 
         **STEP 1: INITIAL GREETING (MANDATORY FIRST STEP)**
         - Begin with: "Namaste, welcome to Birla Opus. Mera naam Anjali hai, kaise sahayata kar sakti hun aapki?"
@@ -51,15 +108,16 @@ class Assistant(Agent):
         Once you understand they need help with KYC/account approval:
         - First ASK: "Kya aap apne registered mobile number se call kar rahe hain?" (Are you calling from your registered mobile number?)
         - Wait for customer response
-        - If customer says YES: Use `hardcoded_context_tool` to get their phone number
+        - If customer says YES: Use `identify_caller_tool` (gets their registered number, looks up their account(s) and the KYC status of each in one call). This tool already tells the customer to wait a moment, so do not announce the check yourself
         - If customer says NO: Ask: "Kya aap apna Opus ID bata sakte hain verification ke liye?" (Can you provide your Opus ID for verification?)
 
         **STEP 3: CUSTOMER LOOKUP AND VERIFICATION**
         Based on what information you have:
+        - If you used `identify_caller_tool` or `customer_full_profile_tool`: You already have the account(s) - do not look them up again
         - If you have phone number from hardcoded context: Use `customer_lookup_tool` with the phone number
-        - If customer provided Opus ID: Use `customer_lookup_by_opus_id_tool` with the provided Opus ID
-        - If phone lookup fails: Ask for Opus ID using `customer_lookup_by_opus_id_tool`
-        - If customer provides a 10-digit phone number directly: Use `verify_phone_number` tool
+        - If customer provided Opus ID: Use `identify_and_check_kyc_tool` with the provided Opus ID (returns the account AND its KYC status in one call). This tool already tells the customer to wait a moment, so do not announce the check yourself
+        - If phone lookup fails: Ask for Opus ID and use `identify_and_check_kyc_tool`
+        - If customer provides a 10-digit phone number directly: Use `customer_full_profile_tool` (returns the account(s) AND their KYC status in one call)
         
         **IMPORTANT FALLBACK**: If phone lookup returns "PHONE_LOOKUP_FAILED" or "No accounts found", immediately ask: "Kya aap apna Opus ID bata sakte hain verification ke liye?"
 
@@ -73,6 +131,7 @@ class Assistant(Agent):
         **STEP 5: CHECK KYC STATUS AUTOMATICALLY**
         After confirming customer identity:
         - AUTOMATICALLY run `kyc_status_checker_tool` with the customer's opus_id
+        - If you identified the customer with `identify_caller_tool`, `customer_full_profile_tool` or `identify_and_check_kyc_tool`, you ALREADY have the KYC result - use it, do not call `kyc_status_checker_tool` again
         - DO NOT ask the customer if their KYC is complete - check it automatically
         - Analyze the results internally before responding to customer
 
@@ -137,7 +196,7 @@ class Assistant(Agent):
         3. ALWAYS confirm customer name - don't assume they've confirmed it
         4. NEVER create complaints/enquiries without first explaining the situation and getting customer consent
         5. Use the correct lookup tool based on what customer provides (phone vs Opus ID)
-        6. ALWAYS auto-run kyc_status_checker_tool after customer identification
+        6. ALWAYS auto-run kyc_status_checker_tool after customer identification (unless identify_caller_tool, customer_full_profile_tool or identify_and_check_kyc_tool already returned it)
         7. Create complaints for timeline exceeded cases, enquiries for within timeline/incomplete KYC
         8. Always console customers experiencing delays
         9. **NEVER ASK CUSTOMERS TO CALL BACK LATER** - Always find a way to help them immediately
@@ -145,14 +204,17 @@ class Assistant(Agent):
         11. Use natural, conversational language instead of robotic phrases
 
         **AVAILABLE TOOLS (USE ONLY THESE):**
-        1. `hardcoded_context_tool` - Get caller phone context (when they say YES to registered number)
-        2. `customer_lookup_tool` - Look up by mobile number (use phone from hardcoded context)
-        3. `customer_lookup_by_opus_id_tool` - Look up by Opus ID (when customer provides Opus ID)
-        4. `verify_phone_number` - Verify phone number and get account details
-        5. `kyc_status_checker_tool` - Check KYC completion status and timeline (auto-run after identification)
-        6. `create_complaint_tool` - Create complaints for delayed approvals (with consent)
-        7. `create_enquiry_tool` - Create enquiries for timeline/incomplete KYC cases (with consent)
-        8. `auto_create_complaint_tool` - Auto-suggest complaint creation for delays (with consent)
+        1. `identify_caller_tool` - Get caller phone, look up their account(s) AND check KYC status in one call (preferred when they say YES to registered number)
+        2. `customer_full_profile_tool` - Look up by a mobile number the customer provides AND check KYC status in one call
+        3. `hardcoded_context_tool` - Get caller phone context (when they say YES to registered number)
+        4. `customer_lookup_tool` - Look up by mobile number (use phone from hardcoded context)
+        5. `customer_lookup_by_opus_id_tool` - Look up by Opus ID only
+        6. `identify_and_check_kyc_tool` - Look up by Opus ID AND check KYC status in one call (preferred when customer provides Opus ID)
+        7. `verify_phone_number` - Verify phone number and get account details
+        8. `kyc_status_checker_tool` - Check KYC completion status and timeline (auto-run after identification)
+        9. `create_complaint_tool` - Create complaints for delayed approvals (with consent)
+        10. `create_enquiry_tool` - Create enquiries for timeline/incomplete KYC cases (with consent)
+        11. `auto_create_complaint_tool` - Auto-suggest complaint creation for delays (with consent)
 
         **LANGUAGE & TONE:**
         - Use mix of Hindi and English as shown in examples
@@ -163,394 +225,110 @@ class Assistant(Agent):
 
         **TOOL USAGE ORDER:**
         1. Ask: "Kya aap apne registered mobile number se call kar rahe hain?"
-        2. `hardcoded_context_tool` (if YES) OR ask for Opus ID (if NO)
-        3. `customer_lookup_tool` OR `customer_lookup_by_opus_id_tool` OR `verify_phone_number`
+        2. `identify_caller_tool` (if YES) OR ask for Opus ID (if NO)
+        3. `customer_full_profile_tool` OR `identify_and_check_kyc_tool` (skip if `identify_caller_tool` already found the account)
         4. Confirm customer name
         5. `kyc_status_checker_tool` (automatically after identification)
         6. Explain situation and get consent
-        7. `create_complaint_tool` OR `create_enquiry_tool` (after consent)""",
-        )
-
-    @function_tool()
-    async def hardcoded_context_tool(self, context: RunContext) -> str:
-        """Get hardcoded context including the caller's phone number."""
-        try:
-            phone_number = "9812345769"  # Using a phone number that exists in mock data
-            return f"Caller is calling from registered number: {phone_number}"
-        except Exception as e:
-            return f"Error retrieving hardcoded context: {str(e)}"
-
-    @function_tool()
-    async def set_caller_context_tool(self, context: RunContext, phone_number: str) -> str:
-        """Set caller context with a specific phone number."""
-        try:
-            context_data = {
-                "success": True,
-                "caller_phone": phone_number,
-                "is_registered_number": True,
-                "context_message": f"Setting caller context for phone number {phone_number}",
-                "verification_status": "verified",
-                "instructions": f"Use phone number {phone_number} for all subsequent customer lookups"
-            }
-            return str(context_data)
-        except Exception as e:
-            return f"Error setting caller context: {str(e)}"
-
-    @function_tool()
-    async def customer_lookup_tool(self, context: RunContext, mobile_number: str) -> str:
-        """Looks up customer details using their 10-digit mobile number."""
-        try:
-            clean_phone = ''.join(filter(str.isdigit, mobile_number))
-            if len(clean_phone) != 10:
-                return "Invalid phone number format. Please provide a 10-digit phone number."
-
-            accounts = _find_customers('mobile_number', clean_phone)
+        7. `create_complaint_tool` OR `create_enquiry_tool` (after consent)"""
 
-            if not accounts:
-                return f"PHONE_LOOKUP_FAILED: No accounts found for mobile number {mobile_number}. Please ask customer for their Opus ID for verification."
-            
-            return f"Found {len(accounts)} account(s): {accounts}. Multiple accounts: {len(accounts) > 1}."
 
-        except Exception as e:
-            return f"An error occurred during customer lookup: {str(e)}"
-
-    @function_tool()
-    async def customer_lookup_by_opus_id_tool(self, context: RunContext, opus_id: str) -> str:
-        """Looks up customer details using their Opus ID."""
-        try:
-            if not opus_id:
-                return "Opus ID was not provided."
+class Assistant(Agent):
+    def __init__(self) -> None:
+        super().__init__(
+            instructions=_INSTRUCTIONS,
+            tools=list(_ASSISTANT_TOOLS),
+        )
 
-            accounts = _find_customers('opus_id', opus_id)
 
-            if not accounts:
-                return f"No account found for Opus ID {opus_id}."
-            
-            return f"Found account: {accounts[0]}."
+def prewarm(proc: JobProcess):
+    # Callers arrive over telephony-band audio, so run Silero at 8 kHz: half the samples
+    # per inference window of the 16 kHz default, with the same 32 ms window length
+    proc.userdata["vad"] = silero.VAD.load(sample_rate=8000)
+    # Build the LLM/STT/TTS clients at worker start so the first call doesn't pay
+    # for client setup. The plugins' own prewarm() hooks are invoked by
+    # AgentSession.start().
+    # Parse the customer CSV into the shared record index before the first caller;
+    # on failure the tools retry the load per call and report the error themselves
+    try:
+        load_customer_index()
+    except Exception:
+        logger.exception("failed to load the customer index")
+    proc.userdata["llm"] = google.LLM(model="gemini-2.5-flash")
+    proc.userdata["stt"] = deepgram.STT(
+        model="nova-2",
+        language="hi",
+        interim_results=True,
+        endpointing_ms=50,
+        smart_format=False,
+        punctuate=False,
+    )
+    # Raw PCM at telephony rate: no Opus decode per chunk and a third of the bytes
+    # of the 24 kHz default. Chirp3-HD stays, it is the only streaming-capable voice family.
+    proc.userdata["tts"] = google.TTS(
+        gender="female",
+        voice_name=TTS_VOICE,
+        language=TTS_LANGUAGE,
+        use_streaming=True,
+        sample_rate=TTS_SAMPLE_RATE,
+        audio_encoding=texttospeech.AudioEncoding.PCM,
+    )
+    # The greeting is identical on every call, so render it before the first job
+    # arrives; on failure the entrypoint synthesizes it through the plugin instead
+    try:
+        proc.userdata["greeting_frames"] = _synthesize_greeting_frames()
+    except Exception:
+        logger.exception("failed to pre-synthesize greeting audio")
+
+
+def _synthesize_greeting_frames() -> list[rtc.AudioFrame]:
+    """Render GREETING with the blocking Google client and slice it into 20 ms frames.
+
+    prewarm() has no event loop, and the plugin's gRPC aio client must not be bound
+    to a throwaway one, so this uses the synchronous client directly.
+    """
+    response = texttospeech.TextToSpeechClient().synthesize_speech(
+        input=texttospeech.SynthesisInput(text=GREETING),
+        voice=texttospeech.VoiceSelectionParams(
+            language_code=TTS_LANGUAGE,
+            name=TTS_VOICE,
+            ssml_gender=texttospeech.SsmlVoiceGender.FEMALE,
+        ),
+        audio_config=texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+            sample_rate_hertz=TTS_SAMPLE_RATE,
+        ),
+        # prewarm() must finish within the worker's initialize_process_timeout (10 s),
+        # so give up early and let the entrypoint synthesize the greeting instead
+        timeout=GREETING_SYNTHESIS_TIMEOUT,
+    )
+    # LINEAR16 responses carry a WAV header
+    with wave.open(io.BytesIO(response.audio_content)) as wav:
+        sample_rate = wav.getframerate()
+        num_channels = wav.getnchannels()
+        pcm = wav.readframes(wav.getnframes())
+
+    bstream = utils.audio.AudioByteStream(
+        sample_rate=sample_rate,
+        num_channels=num_channels,
+        samples_per_channel=sample_rate // 50,
+    )
+    return bstream.push(pcm) + bstream.flush()
 
-        except Exception as e:
-            return f"An error occurred during customer lookup by Opus ID: {str(e)}"
 
-    @function_tool()
-    async def verify_phone_number(self, context: RunContext, phone_number: str) -> dict:
-        """Verify if phone number is registered and get associated accounts."""
-        try:
-            clean_phone = ''.join(filter(str.isdigit, phone_number))
-            
-            if len(clean_phone) != 10:
-                return {
-                    "success": False,
-                    "error": "Invalid phone number format. Please provide a 10-digit phone number."
-                }
-            
-            data_file = get_phone_data_path()
-            
-            if not os.path.exists(data_file):
-                return {
-                    "success": False,
-                    "error": f"Customer data file not found at {data_file}"
-                }
-            
-            accounts = []
-            with open(data_file, 'r', encoding='utf-8') as file:
-                csv_reader = csv.DictReader(file)
-                
-                for row in csv_reader:
-                    row_mobile = ''.join(filter(str.isdigit, row.get('mobile_number', '')))
-                    
-                    if row_mobile == clean_phone:
-                        accounts.append({
-                            "opus_id": row.get('opus_id', ''),
-                            "name": f"{row.get('first_name', '')} {row.get('last_name', '')}".strip(),
-                            "email": row.get('email', ''),
-                            "kyc_status": row.get('kyc_status', ''),
-                            "account_status": row.get('status', ''),
-                            "data_created": row.get('data_created', '')
-                        })
-            
-            if not accounts:
-                return {
-                    "success": True,
-                    "is_registered": False,
-                    "message": f"No accounts found for phone number {phone_number}",
-                    "accounts": []
-                }
-            
-            return {
-                "success": True,
-                "is_registered": True,
-                "message": f"Found {len(accounts)} account(s) for phone number {phone_number}",
-                "accounts": accounts,
-                "multiple_accounts": len(accounts) > 1
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error during phone verification: {str(e)}"
-            }
-
-    @function_tool()
-    async def kyc_status_checker_tool(self, context: RunContext, opus_id: str) -> dict:
-        """Check KYC status and calculate timeline for account approval."""
-        try:
-            data_file = get_kyc_data_path()
-            
-            if not os.path.exists(data_file):
-                return {
-                    "success": False,
-                    "error": f"Customer data file not found at {data_file}"
-                }
-            
-            # Find the customer record
-            customer_record = None
-            with open(data_file, 'r', encoding='utf-8') as file:
-                csv_reader = csv.DictReader(file)
-                
-                for row in csv_reader:
-                    if row.get('opus_id', '') == opus_id:
-                        customer_record = row
-                        break
-            
-            if not customer_record:
-                return {
-                    "success": False,
-                    "error": f"No customer found with Opus ID: {opus_id}"
-                }
-            
-            # Extract KYC information
-            kyc_status = customer_record.get('kyc_status', '')
-            is_aadhar_added = customer_record.get('is_aadhar_added', '').lower() == 'true'
-            is_pan_added = customer_record.get('is_pan_added', '').lower() == 'true'
-            is_bank_added = customer_record.get('is_bank_added', '').lower() == 'true'
-            is_upi_added = customer_record.get('is_upi_added', '').lower() == 'true'
-            data_created_days = int(customer_record.get('data_created', 0))
-            
-            # Calculate registration date (assuming data_created is days ago)
-            registration_date = datetime.now() - timedelta(days=data_created_days)
-            
-            # Determine KYC completion status
-            kyc_documents_complete = is_aadhar_added and is_pan_added and is_bank_added
-            
-            # Analyze KYC status
-            if kyc_status == 'F':  # Full KYC Complete
-                days_since_kyc = data_created_days  # Assuming KYC completed at registration
-                days_remaining = max(0, 30 - days_since_kyc)
-                
-                if days_since_kyc <= 30:
-                    recommendation = "within_timeline"
-                    message = f"KYC is done dont you need to wait {days_remaining} days"
-                else:
-                    recommendation = "timeline_exceeded"
-                    message = "KYC completion 30 days passed. Contact TSM or raise a complaint."
-                    
-            elif kyc_status == 'P':  # Partial KYC
-                recommendation = "partial_kyc"
-                missing_docs = []
-                if not is_aadhar_added:
-                    missing_docs.append("Aadhar")
-                if not is_pan_added:
-                    missing_docs.append("PAN")
-                if not is_bank_added:
-                    missing_docs.append("Bank Details")
-                if not is_upi_added:
-                    missing_docs.append("UPI")
-                    
-                message = f"KYC is not complete. Please complete {', '.join(missing_docs)}"
-                
-            elif kyc_status == 'R':  # Rejected
-                recommendation = "kyc_rejected"
-                message = "KYC is rejected. Please submit documents again."
-                
-            elif kyc_status == 'N':  # Not Started
-                recommendation = "kyc_not_started"
-                message = "KYC is not started. Please complete KYC process."
-                
-            else:
-                recommendation = "unknown_status"
-                message = "KYC status unclear. Please check with technical team."
-            
-            return {
-                "success": True,
-                "opus_id": opus_id,
-                "kyc_status": kyc_status,
-                "kyc_status_description": {
-                    'F': 'Full KYC Complete',
-                    'P': 'Partial KYC',
-                    'R': 'KYC Rejected',
-                    'N': 'KYC Not Started'
-                }.get(kyc_status, 'Unknown'),
-                "documents_status": {
-                    "aadhar": is_aadhar_added,
-                    "pan": is_pan_added,
-                    "bank": is_bank_added,
-                    "upi": is_upi_added
-                },
-                "timeline_info": {
-                    "registration_date": registration_date.strftime("%Y-%m-%d"),
-                    "days_since_registration": data_created_days,
-                    "days_remaining_for_approval": max(0, 30 - data_created_days) if kyc_status == 'F' else None,
-                    "timeline_exceeded": data_created_days > 30 and kyc_status == 'F'
-                },
-                "recommendation": recommendation,
-                "message": message,
-                "customer_name": f"{customer_record.get('first_name', '')} {customer_record.get('last_name', '')}".strip()
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error checking KYC status: {str(e)}"
-            }
-
-    @function_tool()
-    async def auto_create_complaint_tool(self, context: RunContext, opus_id: str, customer_name: str, days_since_kyc: int) -> dict:
-        """Automatically create a complaint if customer has been waiting more than 30 days since KYC completion."""
-        try:
-            # If more than 30 days, automatically create a complaint
-            if days_since_kyc > 30:
-                kyc_completion_date = (datetime.now() - timedelta(days=days_since_kyc)).strftime("%Y-%m-%d")
-                
-                complaint_result = await self.create_complaint_tool(
-                    context=context,
-                    opus_id=opus_id,
-                    customer_name=customer_name,
-                    complaint_type="high_priority",
-                    subject=f"KYC Account Approval Delay - {days_since_kyc} days pending",
-                    issue_description=f"Customer's KYC was completed on {kyc_completion_date} but account approval is still pending after {days_since_kyc} days.",
-                    priority="high"
-                )
-                
-                if complaint_result.get("success"):
-                    return {
-                        "success": True,
-                        "auto_complaint_created": True,
-                        "days_since_kyc": days_since_kyc,
-                        "complaint_number": complaint_result.get("complaint_number"),
-                        "message": f"Main aapke liye complaint create kar diya hun kyunki {days_since_kyc} din se zyada ho gaye hain. Aapka complaint number hai {complaint_result.get('complaint_number')}. Aap apne TSM se bhi contact kar sakte hain.",
-                        "sms_confirmation": complaint_result.get("sms_confirmation"),
-                        "complaint_details": complaint_result.get("complaint_details")
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Failed to create auto-complaint: {complaint_result.get('error')}"
-                    }
-            else:
-                # Within 30 days, no complaint needed
-                days_remaining = 30 - days_since_kyc
-                return {
-                    "success": True,
-                    "auto_complaint_created": False,
-                    "days_since_kyc": days_since_kyc,
-                    "days_remaining": days_remaining,
-                    "message": f"Aapka KYC {days_since_kyc} din pehle complete hua tha. Aapko {days_remaining} din aur wait karna hoga account approval ke liye. Aap apne TSM se bhi contact kar sakte hain.",
-                    "tsm_message": "Aap apne TSM se contact kar sakte hain additional support ke liye."
-                }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error in auto-complaint creation: {str(e)}"
-            }
-
-    @function_tool()
-    async def create_complaint_tool(self, context: RunContext, opus_id: str, customer_name: str, complaint_type: str, 
-                    subject: str, issue_description: str, priority: str) -> dict:
-        """Create a new complaint."""
-        try:
-            complaints = _load_complaints()
-            
-            # Generate complaint number
-            complaint_number = f"KYC{datetime.now().strftime('%Y%m%d')}{len(complaints) + 1:04d}"
-            
-            # Set timeline based on priority
-            timeline_days = 3 if priority == "high" else 7
-            
-            # Create complaint record
-            new_complaint = {
-                "complaint_number": complaint_number,
-                "opus_id": opus_id,
-                "customer_name": customer_name,
-                "type": complaint_type,
-                "subject": subject,
-                "issue_description": issue_description,
-                "priority": priority,
-                "status": "active",
-                "created_date": datetime.now().isoformat(),
-                "timeline_days": timeline_days,
-                "expected_resolution": (datetime.now() + timedelta(days=timeline_days)).isoformat(),
-                "category": "Painter/contractor Complaints" if complaint_type != "enquiry" else "General enquiries/Others",
-                "sub_category": "Opus ID App" if complaint_type != "enquiry" else "Other Enquiries",
-                "escalation_level": "high" if priority == "high" else "standard"
-            }
-            
-            complaints.append(new_complaint)
-            _save_complaints(complaints)
-            
-            return {
-                "success": True,
-                "complaint_created": True,
-                "complaint_number": complaint_number,
-                "timeline_days": timeline_days,
-                "expected_resolution": (datetime.now() + timedelta(days=timeline_days)).strftime("%Y-%m-%d"),
-                "message": f"Complaint {complaint_number} successfully created for {customer_name}",
-                "sms_confirmation": f"आपका complaint number है {complaint_number}. {timeline_days} दिन में resolve होगा।",
-                "complaint_details": new_complaint
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error creating complaint: {str(e)}"
-            }
-
-    @function_tool()
-    async def create_enquiry_tool(self, context: RunContext, opus_id: str, customer_name: str, enquiry_type: str, 
-                  subject: str, description: str) -> dict:
-        """Create a new enquiry (for informational purposes)."""
-        try:
-            complaints = _load_complaints()
-            
-            # Generate enquiry number
-            enquiry_number = f"ENQ{datetime.now().strftime('%Y%m%d')}{len(complaints) + 1:04d}"
-            
-            new_enquiry = {
-                "enquiry_number": enquiry_number,
-                "opus_id": opus_id,
-                "customer_name": customer_name,
-                "type": "enquiry",
-                "enquiry_type": enquiry_type,
-                "subject": subject,
-                "description": description,
-                "status": "logged",
-                "created_date": datetime.now().isoformat(),
-                "category": "General enquiries/Others",
-                "sub_category": "Other Enquiries",
-                "issue": "Become a Painter/Contractor"
-            }
-            
-            complaints.append(new_enquiry)
-            _save_complaints(complaints)
-            
-            return {
-                "success": True,
-                "enquiry_created": True,
-                "enquiry_number": enquiry_number,
-                "message": f"Enquiry {enquiry_number} logged for {customer_name}",
-                "expected_timeline": "2-3 working days for response",
-                "enquiry_details": new_enquiry
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error creating enquiry: {str(e)}"
-            }
+async def _load_greeting_frames(proc: JobProcess) -> list[rtc.AudioFrame]:
+    """Return the greeting audio rendered in prewarm(), synthesizing it on a miss."""
+    frames = proc.userdata.get("greeting_frames")
+    if frames is None:
+        async with proc.userdata["tts"].synthesize(GREETING) as stream:
+            frames = [ev.frame async for ev in stream]
+        proc.userdata["greeting_frames"] = frames
+    return frames
 
 
-def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+async def _replay_frames(frames: list[rtc.AudioFrame]) -> AsyncIterator[rtc.AudioFrame]:
+    for frame in frames:
+        yield frame
 
 
 async def entrypoint(ctx: JobContext):
@@ -562,23 +340,12 @@ async def entrypoint(ctx: JobContext):
 
     # Set up a voice AI pipeline using OpenAI, Cartesia, Deepgram, and the LiveKit turn detector
     session = AgentSession(
-        llm=google.LLM(model="gemini-2.5-flash"),
-        stt=google.STT(model="telephony", spoken_punctuation=False, languages=["en-IN"], use_streaming=True),
-        tts=google.TTS(gender="female", voice_name="hi-IN-Chirp3-HD-Achernar", language="hi-IN", use_streaming=True),
-        vad=silero.VAD.load(
-        ),
-        allow_interruptions=True,
-        discard_audio_if_uninterruptible=False
-        min_interruption_duration=0.1,
-        min_interruption_words=0,
-        min_endpointing_delay=0.1,
-        max_endpointing_delay=0.5,
-        min_consecutive_speech_delay=0.0,
-        resume_false_interruption=False,
-        user_away_timeout=15.0,
-        false_interruption_timeout=2.0,
-        resume_false_interruption=False,
-        min_consecutive_speech_delay=0.0,
+        llm=ctx.proc.userdata["llm"],
+        stt=ctx.proc.userdata["stt"],
+        tts=ctx.proc.userdata["tts"],
+        # reuse the VAD loaded once per worker process in prewarm()
+        vad=ctx.proc.userdata["vad"],
+        **_SESSION_KWARGS,
     )
 
     # To use a realtime model instead of a voice pipeline, use the following session setup instead:
@@ -593,15 +360,60 @@ async def entrypoint(ctx: JobContext):
     # Metrics collection, to measure pipeline performance
     # For more information, see https://docs.livekit.io/agents/build/metrics/
     usage_collector = metrics.UsageCollector()
+    # Logging is buffered and flushed from a worker thread, off the audio path; the
+    # deque is bounded so a stalled flusher can't grow memory without limit
+    metrics_buffer = deque(maxlen=256)
+    # LiveKit cancels a preemptive generation as soon as a newer transcript or a
+    # changed chat context invalidates it; track what those discarded runs cost
+    cancelled_llm = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0}
 
     @session.on("metrics_collected")
     def _on_metrics_collected(ev: MetricsCollectedEvent):
-        metrics.log_metrics(ev.metrics)
+        metrics_buffer.append(ev.metrics)
         usage_collector.collect(ev.metrics)
+        if isinstance(ev.metrics, metrics.LLMMetrics) and ev.metrics.cancelled:
+            cancelled_llm["requests"] += 1
+            cancelled_llm["prompt_tokens"] += ev.metrics.prompt_tokens
+            cancelled_llm["completion_tokens"] += ev.metrics.completion_tokens
+
+    def _flush_metrics():
+        while metrics_buffer:
+            m = metrics_buffer.popleft()
+            metrics.log_metrics(m)
+            if isinstance(m, metrics.TTSMetrics):
+                # first audio chunk should land well before the LLM finishes decoding
+                logger.debug(
+                    f"tts_ttfb={m.ttfb:.3f}s streamed={m.streamed} speech_id={m.speech_id}"
+                )
+
+    async def _flush_metrics_periodically():
+        while True:
+            await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+            if metrics_buffer:
+                # deque appends/pops are thread-safe, so the callback can keep appending
+                flush = asyncio.ensure_future(asyncio.to_thread(_flush_metrics))
+                try:
+                    await asyncio.shield(flush)
+                except asyncio.CancelledError:
+                    # Cancelling can't stop the thread; let it finish so the final
+                    # flush at shutdown is the only one draining the buffer
+                    await flush
+                    raise
+
+    flush_task = asyncio.create_task(_flush_metrics_periodically())
 
     async def log_usage():
+        flush_task.cancel()
+        try:
+            with contextlib.suppress(asyncio.CancelledError):
+                await flush_task
+        except Exception:
+            # a failed periodic flush must not cost us the final flush and summary
+            logger.exception("periodic metrics flush failed")
+        _flush_metrics()
         summary = usage_collector.get_summary()
         logger.info(f"Usage: {summary}")
+        logger.info(f"Cancelled LLM generations: {cancelled_llm}")
 
     ctx.add_shutdown_callback(log_usage)
 
@@ -613,24 +425,39 @@ async def entrypoint(ctx: JobContext):
     # # Start the avatar and wait for it to join
     # await avatar.start(session, room=ctx.room)
 
-    # Start the session, which initializes the voice pipeline and warms up the models
-    await session.start(
-        agent=Assistant(),
-        room=ctx.room,
-        room_input_options=RoomInputOptions(
-            # LiveKit Cloud enhanced noise cancellation
-            # - If self-hosting, omit this parameter
-            # - For telephony applications, use `BVCTelephony` for best results
-            # noise_cancellation=noise_cancellation.BVC(),
-        ),
-    )
-
-    await session.generate_reply(
-        instructions="Greet the user and offer your assistance."
-    )
-
-    # Join the room and connect to the user
-    await ctx.connect()
+    # The greeting audio is fetched (or synthesized on a cold worker) in the background.
+    greeting_task = asyncio.create_task(_load_greeting_frames(ctx.proc))
+
+    # Join the room while the session initializes the voice pipeline and warms up the
+    # models. session.start() only returns once the room is connected (connect() is
+    # idempotent), so the greeting below is never produced into an unjoined room.
+    try:
+        await asyncio.gather(
+            ctx.connect(),
+            session.start(
+                agent=Assistant(),
+                room=ctx.room,
+                room_input_options=RoomInputOptions(
+                    # LiveKit Cloud enhanced noise cancellation
+                    # - If self-hosting, omit this parameter
+                    # - For telephony applications, use `BVCTelephony` for best results
+                    # noise_cancellation=noise_cancellation.BVC(),
+                ),
+            ),
+        )
+    except BaseException:
+        # Don't leave the prefetch pending, or its error unretrieved, if startup failed
+        greeting_task.cancel()
+        await asyncio.gather(greeting_task, return_exceptions=True)
+        raise
+
+    try:
+        greeting_frames = await greeting_task
+    except Exception:
+        logger.exception("failed to prefetch greeting audio, synthesizing inline")
+        await session.say(GREETING)
+    else:
+        await session.say(GREETING, audio=_replay_frames(greeting_frames))
 
 
 if __name__ == "__main__":
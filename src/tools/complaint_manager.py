@@ -3,63 +3,119 @@ Complaint Management tool for KYC Customer Care Bot.
 Handles complaint creation, tracking, and status management.
 """
 
+import asyncio
 import json
 import os
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
-import uuid
+from typing import Dict, Any
 from livekit.agents import function_tool
 
+from .tool_output import _to_json
+
+try:
+    import fcntl
+except ImportError:  # fcntl is POSIX-only; Windows locks the counter with msvcrt
+    fcntl = None
+    import msvcrt
+
+
+# Timeline (days) and escalation level per priority; anything but "high" is standard
+_PRIORITY = {
+    "high": (3, "high"),
+    "standard": (7, "standard"),
+}
+
+# (category, sub_category) pairs
+_COMPLAINT_CATEGORY = ("Painter/contractor Complaints", "Opus ID App")
+_ENQUIRY_CATEGORY = ("General enquiries/Others", "Other Enquiries")
+
 
 def _get_complaints_file_path() -> str:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(os.path.dirname(current_dir))  # Go up two levels from src/tools/
-    return os.path.join(project_root, "data", "complaints.json")
+    return os.path.join(project_root, "data", "complaints.jsonl")
 
-def _load_complaints() -> List[Dict]:
-    """Load existing complaints from JSON file."""
-    complaints_file = _get_complaints_file_path()
-    
-    if not os.path.exists(complaints_file):
-        # Create data directory if it doesn't exist
-        os.makedirs(os.path.dirname(complaints_file), exist_ok=True)
-        return []
-    
+def _get_complaint_seq_file_path() -> str:
+    return os.path.join(os.path.dirname(_get_complaints_file_path()), "complaints_seq.txt")
+
+def _count_complaints() -> int:
+    """Count records in the JSONL log without parsing them."""
     try:
-        with open(complaints_file, 'r', encoding='utf-8') as file:
-            return json.load(file)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+        with open(_get_complaints_file_path(), 'rb') as file:
+            return sum(1 for line in file if line.strip())
+    except FileNotFoundError:
+        return 0
 
 
-def _save_complaints(complaints: List[Dict]) -> None:
-    """Save complaints to JSON file."""
+def _append_complaint(record: Dict) -> None:
+    """Append a single complaint/enquiry record to the JSONL log."""
     complaints_file = _get_complaints_file_path()
     
     # Ensure directory exists
     os.makedirs(os.path.dirname(complaints_file), exist_ok=True)
     
-    with open(complaints_file, 'w', encoding='utf-8') as file:
-        json.dump(complaints, file, indent=2, ensure_ascii=False)
+    # One O_APPEND write() per record, so concurrent workers never interleave lines
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+    fd = os.open(complaints_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
-@function_tool()
-async def auto_create_complaint_tool(opus_id: str, customer_name: str, days_since_kyc: int) -> Dict[str, Any]:
-    """Automatically create a complaint if customer has been waiting more than 30 days since KYC completion.
+
+@contextmanager
+def _exclusive_lock(file):
+    """Hold an exclusive lock on an open file, across processes."""
+    if fcntl is not None:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+        return
     
-    Args:
-        opus_id: Customer's Opus ID
-        customer_name: Customer's full name
-        days_since_kyc: Number of days since KYC completion
-        
-    Returns:
-        Dictionary containing complaint creation details or info if no complaint needed.
+    # msvcrt locks byte ranges from the current position; LK_LOCK retries for ~10 s
+    file.seek(0)
+    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+    try:
+        yield
+    finally:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _next_complaint_seq() -> int:
+    """Reserve the next complaint/enquiry sequence number.
+    
+    The last used number is kept in a small counter file, locked (flock, or
+    msvcrt on Windows) so concurrent workers never hand out the same number. On first use the counter
+    is seeded from the number of records already in the log.
     """
+    seq_file = _get_complaint_seq_file_path()
+    os.makedirs(os.path.dirname(seq_file), exist_ok=True)
+    
+    with open(seq_file, 'a+', encoding='utf-8') as file:
+        with _exclusive_lock(file):
+            file.seek(0)
+            last_seq = file.read().strip()
+            seq = (int(last_seq) if last_seq else _count_complaints()) + 1
+            file.seek(0)
+            file.truncate()
+            file.write(str(seq))
+            file.flush()
+            os.fsync(file.fileno())
+    return seq
+
+async def _auto_create_complaint(opus_id: str, customer_name: str, days_since_kyc: int) -> Dict[str, Any]:
+    """Raise a high-priority complaint once the 30-day approval window has passed."""
     try:
         # If more than 30 days, automatically create a complaint
         if days_since_kyc > 30:
             kyc_completion_date = (datetime.now() - timedelta(days=days_since_kyc)).strftime("%Y-%m-%d")
             
-            complaint_result = await create_complaint_tool(
+            complaint_result = await _create_complaint(
                 opus_id=opus_id,
                 customer_name=customer_name,
                 complaint_type="high_priority",
@@ -101,30 +157,35 @@ async def auto_create_complaint_tool(opus_id: str, customer_name: str, days_sinc
             "error": f"Error in auto-complaint creation: {str(e)}"
         }
 
+
 @function_tool()
-async def create_complaint_tool(opus_id: str, customer_name: str, complaint_type: str, 
-                    subject: str, issue_description: str, priority: str) -> Dict[str, Any]:
-    """Create a new complaint.
+async def auto_create_complaint_tool(opus_id: str, customer_name: str, days_since_kyc: int) -> str:
+    """Automatically create a complaint if customer has been waiting more than 30 days since KYC completion.
     
     Args:
         opus_id: Customer's Opus ID
         customer_name: Customer's full name
-        complaint_type: Type of complaint (high_priority, standard, enquiry)
-        subject: Complaint subject line
-        issue_description: Detailed description of the issue
-        priority: Priority level (high, standard)
+        days_since_kyc: Number of days since KYC completion
         
     Returns:
-        Dictionary containing complaint creation details.
+        JSON object containing complaint creation details or info if no complaint needed.
     """
+    return _to_json(await _auto_create_complaint(opus_id, customer_name, days_since_kyc))
+
+
+async def _create_complaint(opus_id: str, customer_name: str, complaint_type: str, 
+                    subject: str, issue_description: str, priority: str) -> Dict[str, Any]:
+    """Create and persist a complaint record."""
     try:
-        complaints = _load_complaints()
-        
-        # Generate complaint number
-        complaint_number = f"KYC{datetime.now().strftime('%Y%m%d')}{len(complaints) + 1:04d}"
+        # Generate complaint number; the counter file is locked and fsynced, so run it in a thread
+        seq = await asyncio.to_thread(_next_complaint_seq)
+        now = datetime.now()
+        complaint_number = f"KYC{now.strftime('%Y%m%d')}{seq:04d}"
         
         # Set timeline based on priority
-        timeline_days = 3 if priority == "high" else 7
+        timeline_days, escalation_level = _PRIORITY.get(priority, _PRIORITY["standard"])
+        category, sub_category = _ENQUIRY_CATEGORY if complaint_type == "enquiry" else _COMPLAINT_CATEGORY
+        expected_resolution = now + timedelta(days=timeline_days)
         
         # Create complaint record
         new_complaint = {
@@ -136,23 +197,22 @@ async def create_complaint_tool(opus_id: str, customer_name: str, complaint_type
             "issue_description": issue_description,
             "priority": priority,
             "status": "active",
-            "created_date": datetime.now().isoformat(),
+            "created_date": now.isoformat(),
             "timeline_days": timeline_days,
-            "expected_resolution": (datetime.now() + timedelta(days=timeline_days)).isoformat(),
-            "category": "Painter/contractor Complaints" if complaint_type != "enquiry" else "General enquiries/Others",
-            "sub_category": "Opus ID App" if complaint_type != "enquiry" else "Other Enquiries",
-            "escalation_level": "high" if priority == "high" else "standard"
+            "expected_resolution": expected_resolution.isoformat(),
+            "category": category,
+            "sub_category": sub_category,
+            "escalation_level": escalation_level
         }
         
-        complaints.append(new_complaint)
-        _save_complaints(complaints)
+        await asyncio.to_thread(_append_complaint, new_complaint)
         
         return {
             "success": True,
             "complaint_created": True,
             "complaint_number": complaint_number,
             "timeline_days": timeline_days,
-            "expected_resolution": (datetime.now() + timedelta(days=timeline_days)).strftime("%Y-%m-%d"),
+            "expected_resolution": expected_resolution.strftime("%Y-%m-%d"),
             "message": f"Complaint {complaint_number} successfully created for {customer_name}",
             "sms_confirmation": f"आपका complaint number है {complaint_number}. {timeline_days} दिन में resolve होगा।",
             "complaint_details": new_complaint
@@ -164,26 +224,34 @@ async def create_complaint_tool(opus_id: str, customer_name: str, complaint_type
             "error": f"Error creating complaint: {str(e)}"
         }
 
+
 @function_tool()
-async def create_enquiry_tool(opus_id: str, customer_name: str, enquiry_type: str, 
-                  subject: str, description: str) -> Dict[str, Any]:
-    """Create a new enquiry (for informational purposes).
+async def create_complaint_tool(opus_id: str, customer_name: str, complaint_type: str, 
+                    subject: str, issue_description: str, priority: str) -> str:
+    """Create a new complaint.
     
     Args:
         opus_id: Customer's Opus ID
         customer_name: Customer's full name
-        enquiry_type: Type of enquiry
-        subject: Enquiry subject
-        description: Enquiry description
+        complaint_type: Type of complaint (high_priority, standard, enquiry)
+        subject: Complaint subject line
+        issue_description: Detailed description of the issue
+        priority: Priority level (high, standard)
         
     Returns:
-        Dictionary containing enquiry creation details.
+        JSON object containing complaint creation details.
     """
+    return _to_json(await _create_complaint(opus_id, customer_name, complaint_type, subject, issue_description, priority))
+
+
+async def _create_enquiry(opus_id: str, customer_name: str, enquiry_type: str, 
+                  subject: str, description: str) -> Dict[str, Any]:
+    """Create and persist an enquiry record."""
     try:
-        complaints = _load_complaints()
-        
         # Generate enquiry number
-        enquiry_number = f"ENQ{datetime.now().strftime('%Y%m%d')}{len(complaints) + 1:04d}"
+        seq = await asyncio.to_thread(_next_complaint_seq)
+        now = datetime.now()
+        enquiry_number = f"ENQ{now.strftime('%Y%m%d')}{seq:04d}"
         
         new_enquiry = {
             "enquiry_number": enquiry_number,
@@ -194,14 +262,13 @@ async def create_enquiry_tool(opus_id: str, customer_name: str, enquiry_type: st
             "subject": subject,
             "description": description,
             "status": "logged",
-            "created_date": datetime.now().isoformat(),
-            "category": "General enquiries/Others",
-            "sub_category": "Other Enquiries",
+            "created_date": now.isoformat(),
+            "category": _ENQUIRY_CATEGORY[0],
+            "sub_category": _ENQUIRY_CATEGORY[1],
             "issue": "Become a Painter/Contractor"
         }
         
-        complaints.append(new_enquiry)
-        _save_complaints(complaints)
+        await asyncio.to_thread(_append_complaint, new_enquiry)
         
         return {
             "success": True,
@@ -218,3 +285,20 @@ async def create_enquiry_tool(opus_id: str, customer_name: str, enquiry_type: st
             "error": f"Error creating enquiry: {str(e)}"
         }
 
+
+@function_tool()
+async def create_enquiry_tool(opus_id: str, customer_name: str, enquiry_type: str, 
+                  subject: str, description: str) -> str:
+    """Create a new enquiry (for informational purposes).
+    
+    Args:
+        opus_id: Customer's Opus ID
+        customer_name: Customer's full name
+        enquiry_type: Type of enquiry
+        subject: Enquiry subject
+        description: Enquiry description
+        
+    Returns:
+        JSON object containing enquiry creation details.
+    """
+    return _to_json(await _create_enquiry(opus_id, customer_name, enquiry_type, subject, description))
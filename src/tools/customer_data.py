@@ -0,0 +1,169 @@
+"""
+Customer data access for KYC Customer Care Bot.
+Parses the customer CSV once into CustomerRecord objects and serves
+phone, Opus ID and KYC lookups from in-memory indexes.
+"""
+
+import csv
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _get_data_file_path() -> str:
+    """Helper to get the absolute path to the mock data file."""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(os.path.dirname(current_dir))  # Go up two levels from src/tools/
+    return os.path.join(project_root, "data", "mock.csv")
+
+
+# Deletes every non-digit Latin-1 character in one C-level pass
+_NON_DIGITS = str.maketrans('', '', ''.join(chr(c) for c in range(256) if not chr(c).isdigit()))
+
+
+def _clean_digits(value: str) -> str:
+    """Strip everything but digits from a phone number."""
+    cleaned = value.translate(_NON_DIGITS)
+    # The table only covers Latin-1, so fall back for anything else that slipped through
+    if not cleaned.isascii():
+        cleaned = ''.join(filter(str.isdigit, cleaned))
+    return cleaned
+
+
+def _parse_phone(value: str) -> Optional[str]:
+    """Validate a caller-supplied phone number and return its 10 digits, or None."""
+    digits = _clean_digits(value)
+    return digits if len(digits) == 10 else None
+
+
+def _parse_days(value: str) -> Optional[int]:
+    """Parse a day count, returning None for a blank or malformed cell."""
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class CustomerRecord:
+    """One customer row, with flags and day counts already parsed."""
+    opus_id: str
+    mobile_digits: str
+    first_name: str
+    last_name: str
+    email: str
+    account_status: str
+    kyc_status: str
+    is_aadhar_added: bool
+    is_pan_added: bool
+    is_bank_added: bool
+    is_upi_added: bool
+    # None when the CSV cell is blank or not a whole number; only the KYC check needs it
+    data_created_days: Optional[int]
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Optional[str]]) -> "CustomerRecord":
+        # DictReader fills the cells missing from a short row with None
+        def cell(key: str) -> str:
+            return row.get(key) or ''
+
+        return cls(
+            opus_id=cell('opus_id'),
+            mobile_digits=_clean_digits(cell('mobile_number')),
+            first_name=cell('first_name'),
+            last_name=cell('last_name'),
+            email=cell('email'),
+            account_status=cell('status'),
+            kyc_status=cell('kyc_status'),
+            is_aadhar_added=cell('is_aadhar_added').lower() == 'true',
+            is_pan_added=cell('is_pan_added').lower() == 'true',
+            is_bank_added=cell('is_bank_added').lower() == 'true',
+            is_upi_added=cell('is_upi_added').lower() == 'true',
+            data_created_days=_parse_days(cell('data_created')),
+        )
+
+    @property
+    def name(self) -> str:
+        return f"{self.first_name} {self.last_name}".strip()
+
+    @property
+    def document_flags(self) -> Tuple[bool, bool, bool, bool]:
+        """Aadhar, PAN, bank and UPI flags, in that order."""
+        return (self.is_aadhar_added, self.is_pan_added, self.is_bank_added, self.is_upi_added)
+
+    def lookup_summary(self) -> Dict[str, Any]:
+        """Just the fields the LLM needs to identify the account."""
+        return {
+            "opus_id": self.opus_id,
+            "name": self.name,
+            "kyc_status": self.kyc_status
+        }
+
+    def account_summary(self) -> Dict[str, Any]:
+        """The account fields returned by the lookup tools."""
+        return {
+            "opus_id": self.opus_id,
+            "name": self.name,
+            "email": self.email,
+            "kyc_status": self.kyc_status,
+            "account_status": self.account_status,
+            "data_created": "" if self.data_created_days is None else str(self.data_created_days)
+        }
+
+
+# Rebuilt only when the CSV's mtime changes
+_index_mtime: Optional[float] = None
+_RECORDS_BY_PHONE: Dict[str, List[CustomerRecord]] = {}
+_RECORDS_BY_OPUS: Dict[str, CustomerRecord] = {}
+# Lookups run in worker threads, so only one of them should rebuild at a time
+_index_lock = threading.Lock()
+
+
+def _load_index() -> None:
+    """Parse the CSV and rebuild the phone and Opus ID indexes if the file changed."""
+    global _index_mtime, _RECORDS_BY_PHONE, _RECORDS_BY_OPUS
+
+    data_file = _get_data_file_path()
+    mtime = os.stat(data_file).st_mtime
+    if mtime == _index_mtime:
+        return
+
+    with _index_lock:
+        if mtime == _index_mtime:
+            return
+
+        by_phone: Dict[str, List[CustomerRecord]] = {}
+        by_opus: Dict[str, CustomerRecord] = {}
+        with open(data_file, 'r', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                if None in row.values():
+                    logger.warning(f"row on line {reader.line_num} of {data_file} is missing cells")
+                record = CustomerRecord.from_row(row)
+                if record.data_created_days is None:
+                    # Keep the row so phone and Opus ID lookups still find it
+                    logger.warning(
+                        f"invalid data_created {row.get('data_created')!r} for Opus ID {record.opus_id}"
+                    )
+                by_phone.setdefault(record.mobile_digits, []).append(record)
+                # Opus IDs match case-insensitively; first row wins, matching the old top-to-bottom scan
+                by_opus.setdefault(record.opus_id.lower(), record)
+
+        _RECORDS_BY_PHONE, _RECORDS_BY_OPUS = by_phone, by_opus
+        _index_mtime = mtime
+
+
+def _records_for_phone(clean_phone: str) -> List[CustomerRecord]:
+    """Return all customers registered to a digits-only phone number."""
+    _load_index()
+    return _RECORDS_BY_PHONE.get(clean_phone, [])
+
+
+def _record_for_opus_id(opus_id: str) -> Optional[CustomerRecord]:
+    """Return the customer for an Opus ID, or None if it is unknown."""
+    _load_index()
+    return _RECORDS_BY_OPUS.get(opus_id.lower())
@@ -4,91 +4,105 @@ Customer lookup tools for KYC Customer Care Bot.
 - Look up by Opus ID
 """
 
-import csv
-import os
+import asyncio
+from functools import partial
 from typing import Dict, Any, List
-from livekit.agents import function_tool
+from livekit.agents import function_tool, RunContext
+
+from .customer_data import _parse_phone, _records_for_phone, _record_for_opus_id
+from .tool_output import _to_json
+from .turn_cache import _coalesced
 
-def _get_data_file_path() -> str:
-    """Helper to get the absolute path to the mock data file."""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(os.path.dirname(current_dir))  # Go up two levels from src/tools/
-    return os.path.join(project_root, "data", "mock.csv")
 
 def _find_customers(key: str, value: str) -> List[Dict[str, Any]]:
-    """Internal function to search for customers in the CSV."""
-    data_file = _get_data_file_path()
-    if not os.path.exists(data_file):
-        raise FileNotFoundError(f"Customer data file not found at {data_file}")
-
-    accounts = []
-    with open(data_file, 'r', encoding='utf-8') as file:
-        csv_reader = csv.DictReader(file)
-        for row in csv_reader:
-            if key == 'mobile_number':
-                # For mobile numbers, clean both values and compare as strings
-                row_value = ''.join(filter(str.isdigit, row.get(key, '')))
-                if row_value == value:
-                    accounts.append({
-                        "opus_id": row.get('opus_id', ''),
-                        "name": f"{row.get('first_name', '')} {row.get('last_name', '')}".strip(),
-                        "email": row.get('email', ''),
-                        "kyc_status": row.get('kyc_status', ''),
-                        "account_status": row.get('status', ''),
-                        "data_created": row.get('data_created', '')
-                    })
-            else:
-                # For other fields like opus_id, compare as strings (case insensitive)
-                row_value = row.get(key, '')
-                if row_value.lower() == value.lower():
-                    accounts.append({
-                        "opus_id": row.get('opus_id', ''),
-                        "name": f"{row.get('first_name', '')} {row.get('last_name', '')}".strip(),
-                        "email": row.get('email', ''),
-                        "kyc_status": row.get('kyc_status', ''),
-                        "account_status": row.get('status', ''),
-                        "data_created": row.get('data_created', '')
-                    })
-    return accounts
+    """Internal function to search for customers in the in-memory index."""
+    if key == 'mobile_number':
+        return [record.lookup_summary() for record in _records_for_phone(value)]
 
-@function_tool()
-async def customer_lookup_tool(mobile_number: str) -> str:
-    """
-    Looks up customer details using their 10-digit mobile number.
-    Use this tool when the customer confirms they are calling from their registered number.
-    """
+    # Opus IDs are unique and matched case-insensitively
+    record = _record_for_opus_id(value)
+    return [record.lookup_summary()] if record else []
+
+async def _lookup_by_phone(context: RunContext, mobile_number: str) -> Dict[str, Any]:
+    """Look up the accounts registered to a mobile number."""
     try:
-        clean_phone = ''.join(filter(str.isdigit, mobile_number))
-        if len(clean_phone) != 10:
-            return "Invalid phone number format. Please provide a 10-digit phone number."
+        clean_phone = _parse_phone(mobile_number)
+        if clean_phone is None:
+            return {
+                "success": False,
+                "error": "Invalid phone number format. Please provide a 10-digit phone number."
+            }
 
-        accounts = _find_customers('mobile_number', clean_phone)
+        accounts = await _coalesced(
+            context, ("mobile_number", clean_phone),
+            partial(asyncio.to_thread, _find_customers, 'mobile_number', clean_phone)
+        )
 
         if not accounts:
-            return f"No accounts found for mobile number {mobile_number}."
-        
-        return f"Found {len(accounts)} account(s): {accounts}. Multiple accounts: {len(accounts) > 1}."
+            return {
+                "success": False,
+                "error": f"PHONE_LOOKUP_FAILED: No accounts found for mobile number {mobile_number}. Please ask customer for their Opus ID for verification."
+            }
+
+        return {
+            "success": True,
+            "accounts": accounts,
+            "multiple_accounts": len(accounts) > 1
+        }
 
     except Exception as e:
-        return f"An error occurred during customer lookup: {str(e)}"
+        return {
+            "success": False,
+            "error": f"An error occurred during customer lookup: {str(e)}"
+        }
+
 
 @function_tool()
-async def customer_lookup_by_opus_id_tool(opus_id: str) -> str:
+async def customer_lookup_tool(context: RunContext, mobile_number: str) -> str:
     """
-    Looks up customer details using their Opus ID.
-    Use this tool when the customer provides their Opus ID for verification.
+    Looks up customer details using their 10-digit mobile number.
+    Use this tool when the customer confirms they are calling from their registered number.
     """
+    return _to_json(await _lookup_by_phone(context, mobile_number))
+
+
+async def _lookup_by_opus_id(context: RunContext, opus_id: str) -> Dict[str, Any]:
+    """Look up the account for an Opus ID."""
     try:
         if not opus_id:
-            return "Opus ID was not provided."
+            return {
+                "success": False,
+                "error": "Opus ID was not provided."
+            }
 
-        accounts = _find_customers('opus_id', opus_id)
+        accounts = await _coalesced(
+            context, ("opus_id", opus_id),
+            partial(asyncio.to_thread, _find_customers, 'opus_id', opus_id)
+        )
 
         if not accounts:
-            return f"No account found for Opus ID {opus_id}."
-        
+            return {
+                "success": False,
+                "error": f"No account found for Opus ID {opus_id}."
+            }
+
         # Assuming Opus ID is unique, so we expect only one account
-        return f"Found account: {accounts[0]}."
+        return {
+            "success": True,
+            "account": accounts[0]
+        }
 
     except Exception as e:
-        return f"An error occurred during customer lookup by Opus ID: {str(e)}"
\ No newline at end of file
+        return {
+            "success": False,
+            "error": f"An error occurred during customer lookup by Opus ID: {str(e)}"
+        }
+
+
+@function_tool()
+async def customer_lookup_by_opus_id_tool(context: RunContext, opus_id: str) -> str:
+    """
+    Looks up customer details using their Opus ID.
+    Use this tool when the customer provides their Opus ID for verification.
+    """
+    return _to_json(await _lookup_by_opus_id(context, opus_id))
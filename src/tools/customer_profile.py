@@ -0,0 +1,191 @@
+"""
+Customer profile tools for KYC Customer Care Bot.
+Identify a customer and check their KYC status in a single tool call:
+- by the caller's registered number
+- by a mobile number the customer provides
+- by Opus ID
+"""
+
+import asyncio
+from functools import partial
+from typing import Dict, Any, List
+from livekit.agents import function_tool, RunContext
+
+from .customer_data import _parse_phone
+from .customer_lookup import _find_customers
+from .hardcoded_context import _CALLER_PHONE
+from .kyc_status_checker import _check_kyc_status
+from .tool_output import _to_json
+from .turn_cache import _coalesced
+
+
+# Spoken while the lookups and the follow-up LLM reply are in flight
+_PROCESSING_FILLER = "Ek moment, main aapka account check kar rahi hun."
+
+
+# KYC report fields that repeat the account summary, or only flag the report's own success
+_KYC_DUPLICATE_FIELDS = frozenset(("success", "opus_id", "kyc_status", "customer_name"))
+
+
+def _with_kyc(account: Dict[str, Any], report: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge a KYC report into its account summary so every field appears once."""
+    if not report.get("success"):
+        return {**account, "kyc_error": report.get("error")}
+    merged = dict(account)
+    merged.update((key, value) for key, value in report.items() if key not in _KYC_DUPLICATE_FIELDS)
+    return merged
+
+
+async def _profiles_for_phone(context: RunContext, phone: str) -> List[Dict[str, Any]]:
+    """Look up the accounts registered to a phone and merge in each one's KYC report."""
+    accounts = await _coalesced(
+        context, ("mobile_number", phone),
+        partial(asyncio.to_thread, _find_customers, 'mobile_number', phone)
+    )
+    # The reports are independent of each other, so check every account at once
+    reports = await asyncio.gather(*(
+        _coalesced(context, ("kyc", account["opus_id"]), partial(_check_kyc_status, account["opus_id"]))
+        for account in accounts
+    ))
+    return [_with_kyc(account, report) for account, report in zip(accounts, reports)]
+
+
+async def _identify_caller(context: RunContext) -> Dict[str, Any]:
+    """Identify the caller by their registered number and check KYC for each account."""
+    try:
+        context.session.say(_PROCESSING_FILLER, allow_interruptions=True, add_to_chat_ctx=False)
+
+        phone = _CALLER_PHONE
+        accounts = await _profiles_for_phone(context, phone)
+
+        if not accounts:
+            return {
+                "success": False,
+                "caller_phone": phone,
+                "error": f"PHONE_LOOKUP_FAILED: No accounts found for mobile number {phone}. Please ask customer for their Opus ID for verification."
+            }
+
+        return {
+            "success": True,
+            "caller_phone": phone,
+            "accounts": accounts,
+            "multiple_accounts": len(accounts) > 1
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"An error occurred during caller identification: {str(e)}"
+        }
+
+
+@function_tool()
+async def identify_caller_tool(context: RunContext) -> str:
+    """Identify a caller who is calling from their registered number.
+    Gets the caller's phone number, looks up the accounts registered to it and
+    checks the KYC status of each one - all in one step.
+    Use this tool when the customer confirms they are calling from their registered number.
+
+    Returns:
+        JSON object containing the caller's phone number and the matching accounts,
+        each with its KYC status fields.
+    """
+    return _to_json(await _identify_caller(context))
+
+
+async def _customer_full_profile(context: RunContext, mobile_number: str) -> Dict[str, Any]:
+    """Look up a customer-provided mobile number and check KYC for each account."""
+    try:
+        clean_phone = _parse_phone(mobile_number)
+        if clean_phone is None:
+            return {
+                "success": False,
+                "error": "Invalid phone number format. Please provide a 10-digit phone number."
+            }
+
+        context.session.say(_PROCESSING_FILLER, allow_interruptions=True, add_to_chat_ctx=False)
+
+        accounts = await _profiles_for_phone(context, clean_phone)
+
+        if not accounts:
+            return {
+                "success": False,
+                "error": f"PHONE_LOOKUP_FAILED: No accounts found for mobile number {mobile_number}. Please ask customer for their Opus ID for verification."
+            }
+
+        return {
+            "success": True,
+            "accounts": accounts,
+            "multiple_accounts": len(accounts) > 1
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"An error occurred during customer lookup: {str(e)}"
+        }
+
+
+@function_tool()
+async def customer_full_profile_tool(context: RunContext, mobile_number: str) -> str:
+    """Look up a customer by a 10-digit mobile number and check KYC status in one step.
+    Use this tool when the customer tells you a phone number directly.
+
+    Args:
+        mobile_number: The phone number the customer provided (10-digit number)
+
+    Returns:
+        JSON object containing the accounts registered to the number, each with its KYC status fields.
+    """
+    return _to_json(await _customer_full_profile(context, mobile_number))
+
+
+async def _identify_and_check_kyc(context: RunContext, opus_id: str) -> Dict[str, Any]:
+    """Look up an Opus ID and check its KYC status."""
+    try:
+        if not opus_id:
+            return {
+                "success": False,
+                "error": "Opus ID was not provided."
+            }
+
+        # The reply speech is already marked done when tools run, so this plays right
+        # away instead of leaving the caller in silence; keep it out of the chat history
+        context.session.say(_PROCESSING_FILLER, allow_interruptions=True, add_to_chat_ctx=False)
+
+        # Both lookups only need the Opus ID, so run them side by side
+        accounts, kyc = await asyncio.gather(
+            _coalesced(context, ("opus_id", opus_id), partial(asyncio.to_thread, _find_customers, 'opus_id', opus_id)),
+            _coalesced(context, ("kyc", opus_id), partial(_check_kyc_status, opus_id)),
+        )
+
+        if not accounts:
+            return {
+                "success": False,
+                "error": f"No account found for Opus ID {opus_id}."
+            }
+
+        return {
+            "success": True,
+            "account": _with_kyc(accounts[0], kyc)
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"An error occurred during customer identification: {str(e)}"
+        }
+
+
+@function_tool()
+async def identify_and_check_kyc_tool(context: RunContext, opus_id: str) -> str:
+    """Look up a customer by Opus ID and check their KYC status in one step.
+    Use this tool when the customer provides their Opus ID for verification.
+
+    Args:
+        opus_id: The customer's Opus ID
+
+    Returns:
+        JSON object containing the matching account with its KYC status fields.
+    """
+    return _to_json(await _identify_and_check_kyc(context, opus_id))
@@ -3,21 +3,23 @@ Hardcoded Context tool for KYC Customer Care Bot.
 Provides predefined context about the caller's phone number.
 """
 
-from typing import Dict, Any
 from livekit.agents import function_tool
 
+from .tool_output import _to_json
+
+
+# Stands in for the caller ID the telephony layer would provide
+_CALLER_PHONE = "9812345769"
+_HARDCODED_CONTEXT_RESULT = f"Caller is calling from registered number: {_CALLER_PHONE}"
+
+
 @function_tool()
 async def hardcoded_context_tool() -> str:
     """
     Get hardcoded context including the caller's phone number.
     This tool simulates getting the caller's phone number from the call infrastructure.
     """
-    try:
-        phone_number = "9812345769"
-        return f"Caller is calling from registered number: {phone_number}"
-        
-    except Exception as e:
-        return f"Error retrieving hardcoded context: {str(e)}"
+    return _HARDCODED_CONTEXT_RESULT
 
 @function_tool()
 async def set_caller_context_tool(phone_number: str) -> str:
@@ -35,7 +37,10 @@ async def set_caller_context_tool(phone_number: str) -> str:
             "instructions": f"Use phone number {phone_number} for all subsequent customer lookups"
         }
         
-        return str(context)
+        return _to_json(context)
         
     except Exception as e:
-        return f"Error setting caller context: {str(e)}"
\ No newline at end of file
+        return _to_json({
+            "success": False,
+            "error": f"Error setting caller context: {str(e)}"
+        })
\ No newline at end of file
@@ -3,120 +3,104 @@ KYC Status Checker tool for KYC Customer Care Bot.
 Checks KYC completion status and calculates timeline information.
 """
 
-import csv
-import os
+import asyncio
+from functools import partial
 from datetime import datetime, timedelta
-from typing import Dict, Any
-from livekit.agents import function_tool
+from types import MappingProxyType
+from typing import Dict, Any, Tuple
+from livekit.agents import function_tool, RunContext
 
-def _get_data_file_path() -> str:
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(os.path.dirname(current_dir))  # Go up two levels from src/tools/
-    return os.path.join(project_root, "data", "mock.csv")
+from .customer_data import CustomerRecord, _get_data_file_path, _record_for_opus_id
+from .tool_output import _to_json
+from .turn_cache import _coalesced
 
-@function_tool()
-async def kyc_status_checker_tool(opus_id: str) -> Dict[str, Any]:
-    """Check KYC status and calculate timeline for account approval.
-    
-    Args:
-        opus_id: The Opus ID to check KYC status for
-        
-    Returns:
-        Dictionary containing KYC status, timeline information, and recommendations.
-    """
+
+_KYC_DESC = MappingProxyType({
+    'F': 'Full KYC Complete',
+    'P': 'Partial KYC',
+    'R': 'KYC Rejected',
+    'N': 'KYC Not Started'
+})
+
+# Report keys and spoken names, in the order of CustomerRecord.document_flags
+_DOC_KEYS = ("aadhar", "pan", "bank", "upi")
+_MISSING_DOC_NAMES = ("Aadhar", "PAN", "Bank Details", "UPI")
+
+
+def _full_kyc(record: CustomerRecord) -> Tuple[str, str]:
+    days_since_kyc = record.data_created_days  # Assuming KYC completed at registration
+    if days_since_kyc <= 30:
+        return "within_timeline", f"KYC is done dont you need to wait {max(0, 30 - days_since_kyc)} days"
+    return "timeline_exceeded", "KYC completion 30 days passed. Contact TSM or raise a complaint."
+
+
+def _partial_kyc(record: CustomerRecord) -> Tuple[str, str]:
+    missing_docs = [name for name, added in zip(_MISSING_DOC_NAMES, record.document_flags) if not added]
+    return "partial_kyc", f"KYC is not complete. Please complete {', '.join(missing_docs)}"
+
+
+def _rejected_kyc(record: CustomerRecord) -> Tuple[str, str]:
+    return "kyc_rejected", "KYC is rejected. Please submit documents again."
+
+
+def _kyc_not_started(record: CustomerRecord) -> Tuple[str, str]:
+    return "kyc_not_started", "KYC is not started. Please complete KYC process."
+
+
+def _unknown_kyc(record: CustomerRecord) -> Tuple[str, str]:
+    return "unknown_status", "KYC status unclear. Please check with technical team."
+
+
+# (recommendation, message) builder per KYC status code
+_KYC_HANDLERS = {
+    'F': _full_kyc,
+    'P': _partial_kyc,
+    'R': _rejected_kyc,
+    'N': _kyc_not_started,
+}
+
+
+async def _check_kyc_status(opus_id: str) -> Dict[str, Any]:
+    """Build the KYC status report for an Opus ID; shared by the KYC tools."""
     try:
-        data_file = _get_data_file_path()
-        
-        if not os.path.exists(data_file):
+        # Find the customer record
+        try:
+            customer_record = await asyncio.to_thread(_record_for_opus_id, opus_id)
+        except FileNotFoundError:
             return {
                 "success": False,
-                "error": f"Customer data file not found at {data_file}"
+                "error": f"Customer data file not found at {_get_data_file_path()}"
             }
         
-        # Find the customer record
-        customer_record = None
-        with open(data_file, 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            
-            for row in csv_reader:
-                if row.get('opus_id', '') == opus_id:
-                    customer_record = row
-                    break
-        
         if not customer_record:
             return {
                 "success": False,
                 "error": f"No customer found with Opus ID: {opus_id}"
             }
         
-        # Extract KYC information
-        kyc_status = customer_record.get('kyc_status', '')
-        is_aadhar_added = customer_record.get('is_aadhar_added', '').lower() == 'true'
-        is_pan_added = customer_record.get('is_pan_added', '').lower() == 'true'
-        is_bank_added = customer_record.get('is_bank_added', '').lower() == 'true'
-        is_upi_added = customer_record.get('is_upi_added', '').lower() == 'true'
-        data_created_days = int(customer_record.get('data_created', 0))
+        if customer_record.data_created_days is None:
+            return {
+                "success": False,
+                "error": f"Error checking KYC status: invalid registration age for Opus ID {opus_id}"
+            }
+        
+        # Extract KYC information (already parsed when the index was built)
+        kyc_status = customer_record.kyc_status
+        data_created_days = customer_record.data_created_days
         
         # Calculate registration date (assuming data_created is days ago)
         registration_date = datetime.now() - timedelta(days=data_created_days)
         
-        # Determine KYC completion status
-        kyc_documents_complete = is_aadhar_added and is_pan_added and is_bank_added
-        
         # Analyze KYC status
-        if kyc_status == 'F':  # Full KYC Complete
-            days_since_kyc = data_created_days  # Assuming KYC completed at registration
-            days_remaining = max(0, 30 - days_since_kyc)
-            
-            if days_since_kyc <= 30:
-                recommendation = "within_timeline"
-                message = f"KYC is done dont you need to wait {days_remaining} days"
-            else:
-                recommendation = "timeline_exceeded"
-                message = "KYC completion 30 days passed. Contact TSM or raise a complaint."
-                
-        elif kyc_status == 'P':  # Partial KYC
-            recommendation = "partial_kyc"
-            missing_docs = []
-            if not is_aadhar_added:
-                missing_docs.append("Aadhar")
-            if not is_pan_added:
-                missing_docs.append("PAN")
-            if not is_bank_added:
-                missing_docs.append("Bank Details")
-            if not is_upi_added:
-                missing_docs.append("UPI")
-                
-            message = f"KYC is not complete. Please complete {', '.join(missing_docs)}"
-            
-        elif kyc_status == 'R':  # Rejected
-            recommendation = "kyc_rejected"
-            message = "KYC is rejected. Please submit documents again."
-            
-        elif kyc_status == 'N':  # Not Started
-            recommendation = "kyc_not_started"
-            message = "KYC is not started. Please complete KYC process."
-            
-        else:
-            recommendation = "unknown_status"
-            message = "KYC status unclear. Please check with technical team."
+        handler = _KYC_HANDLERS.get(kyc_status, _unknown_kyc)
+        recommendation, message = handler(customer_record)
         
         return {
             "success": True,
-            "opus_id": opus_id,
+            "opus_id": customer_record.opus_id,
             "kyc_status": kyc_status,
-            "kyc_status_description": {
-                'F': 'Full KYC Complete',
-                'P': 'Partial KYC',
-                'R': 'KYC Rejected',
-                'N': 'KYC Not Started'
-            }.get(kyc_status, 'Unknown'),
-            "documents_status": {
-                "aadhar": is_aadhar_added,
-                "pan": is_pan_added,
-                "bank": is_bank_added,
-                "upi": is_upi_added
-            },
+            "kyc_status_description": _KYC_DESC.get(kyc_status, 'Unknown'),
+            "documents_status": dict(zip(_DOC_KEYS, customer_record.document_flags)),
             "timeline_info": {
                 "registration_date": registration_date.strftime("%Y-%m-%d"),
                 "days_since_registration": data_created_days,
@@ -125,7 +109,7 @@ async def kyc_status_checker_tool(opus_id: str) -> Dict[str, Any]:
             },
             "recommendation": recommendation,
             "message": message,
-            "customer_name": f"{customer_record.get('first_name', '')} {customer_record.get('last_name', '')}".strip()
+            "customer_name": customer_record.name
         }
         
     except Exception as e:
@@ -135,7 +119,14 @@ async def kyc_status_checker_tool(opus_id: str) -> Dict[str, Any]:
         }
 
 
-
-
-
-
+@function_tool()
+async def kyc_status_checker_tool(context: RunContext, opus_id: str) -> str:
+    """Check KYC status and calculate timeline for account approval.
+    
+    Args:
+        opus_id: The Opus ID to check KYC status for
+        
+    Returns:
+        JSON object containing KYC status, timeline information, and recommendations.
+    """
+    return _to_json(await _coalesced(context, ("kyc", opus_id), partial(_check_kyc_status, opus_id)))
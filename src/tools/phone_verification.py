@@ -3,62 +3,41 @@ Phone verification tool for KYC Customer Care Bot.
 Verifies if customer is calling from registered phone number.
 """
 
-import csv
-import os
-from typing import Dict, Any, List
-from livekit.agents import function_tool
+import asyncio
+from functools import partial
+from typing import Dict, Any
+from livekit.agents import function_tool, RunContext
 
+from .customer_data import _parse_phone, _get_data_file_path, _records_for_phone
+from .tool_output import _to_json
+from .turn_cache import _coalesced
 
-def _get_data_file_path() -> str:
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(os.path.dirname(current_dir))  # Go up two levels from src/tools/
-    return os.path.join(project_root, "data", "mock.csv")
 
-@function_tool()
-async def verify_phone_number(phone_number: str) -> Dict[str, Any]:
-    """Verify if phone number is registered and get associated accounts.
-    
-    Args:
-        phone_number: The phone number to verify (10-digit number)
-        
-    Returns:
-        Dictionary containing verification status and associated accounts.
-    """
+async def _verify_phone_number(context: RunContext, phone_number: str) -> Dict[str, Any]:
+    """Look up the accounts registered to a phone number, with their details."""
     try:
         # Clean the phone number
-        clean_phone = ''.join(filter(str.isdigit, phone_number))
+        clean_phone = _parse_phone(phone_number)
         
-        if len(clean_phone) != 10:
+        if clean_phone is None:
             return {
                 "success": False,
                 "error": "Invalid phone number format. Please provide a 10-digit phone number."
             }
         
-        data_file = _get_data_file_path()
-        
-        if not os.path.exists(data_file):
+        # Look up accounts with this phone number in the in-memory index;
+        # a (re)load reads the CSV, so keep it off the event loop
+        try:
+            records = await _coalesced(
+                context, ("phone_records", clean_phone),
+                partial(asyncio.to_thread, _records_for_phone, clean_phone)
+            )
+        except FileNotFoundError:
             return {
                 "success": False,
-                "error": f"Customer data file not found at {data_file}"
+                "error": f"Customer data file not found at {_get_data_file_path()}"
             }
-        
-        # Search for accounts with this phone number
-        accounts = []
-        with open(data_file, 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            
-            for row in csv_reader:
-                row_mobile = ''.join(filter(str.isdigit, row.get('mobile_number', '')))
-                
-                if row_mobile == clean_phone:
-                    accounts.append({
-                        "opus_id": row.get('opus_id', ''),
-                        "name": f"{row.get('first_name', '')} {row.get('last_name', '')}".strip(),
-                        "email": row.get('email', ''),
-                        "kyc_status": row.get('kyc_status', ''),
-                        "account_status": row.get('status', ''),
-                        "data_created": row.get('data_created', '')
-                    })
+        accounts = [record.account_summary() for record in records]
         
         if not accounts:
             return {
@@ -83,7 +62,14 @@ async def verify_phone_number(phone_number: str) -> Dict[str, Any]:
         }
 
 
-
-
-
-
+@function_tool()
+async def verify_phone_number(context: RunContext, phone_number: str) -> str:
+    """Verify if phone number is registered and get associated accounts.
+    
+    Args:
+        phone_number: The phone number to verify (10-digit number)
+        
+    Returns:
+        JSON object containing verification status and associated accounts.
+    """
+    return _to_json(await _verify_phone_number(context, phone_number))
@@ -0,0 +1,13 @@
+"""
+Tool result encoding for KYC Customer Care Bot.
+LiveKit passes a tool's return value to the LLM as str(result), so tools
+encode their results as compact JSON rather than handing over a dict repr.
+"""
+
+import json
+from typing import Any, Dict
+
+
+def _to_json(result: Dict[str, Any]) -> str:
+    """Encode a tool result as compact JSON; Hindi/Hinglish text stays unescaped."""
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
@@ -0,0 +1,32 @@
+"""
+Per-turn request coalescing for KYC Customer Care Bot tools.
+Identical read-only lookups made by the LLM within one turn share a single result.
+"""
+
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from livekit.agents import RunContext
+
+# Keyed by the turn's SpeechHandle, which every tool step of the turn shares; the
+# table is dropped with the handle, so nothing carries over into the next turn
+_TURN_RESULTS: "weakref.WeakKeyDictionary[Any, Dict[Hashable, asyncio.Future]]" = weakref.WeakKeyDictionary()
+
+
+def _retrieve_exception(future: asyncio.Future) -> None:
+    # Every awaiter may have been cancelled before the lookup failed; mark the
+    # error as seen so asyncio doesn't log "exception was never retrieved"
+    if not future.cancelled():
+        future.exception()
+
+
+async def _coalesced(context: RunContext, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Run factory() once per key per turn; later identical calls await the same result."""
+    results = _TURN_RESULTS.setdefault(context.speech_handle, {})
+    future = results.get(key)
+    if future is None:
+        future = asyncio.ensure_future(factory())
+        future.add_done_callback(_retrieve_exception)
+        results[key] = future
+    # Shield so an interrupted caller doesn't cancel the lookup for the others
+    return await asyncio.shield(future)
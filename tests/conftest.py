@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from tools import customer_data
+
+CSV_HEADER = "id,opus_id,first_name,last_name,mobile_number,email,status,kyc_status,is_aadhar_added,is_pan_added,is_bank_added,is_upi_added,data_created\n"
+
+
+@pytest.fixture
+def customer_csv(tmp_path, monkeypatch):
+    """Point the index at a temp CSV and start every test from an empty index.
+
+    Returns a writer taking data rows (without the header line).
+    """
+    path = tmp_path / "mock.csv"
+    monkeypatch.setattr(customer_data, "_get_data_file_path", lambda: str(path))
+    monkeypatch.setattr(customer_data, "_index_mtime", None)
+    monkeypatch.setattr(customer_data, "_RECORDS_BY_PHONE", {})
+    monkeypatch.setattr(customer_data, "_RECORDS_BY_OPUS", {})
+
+    def write(*rows: str) -> None:
+        path.write_text(CSV_HEADER + "".join(rows), encoding="utf-8")
+        # Bump the mtime explicitly; back-to-back writes can land in the same tick
+        stamp = (customer_data._index_mtime or 1_000_000) + 10
+        os.utime(path, (stamp, stamp))
+
+    return write
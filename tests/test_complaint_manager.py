@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from tools import complaint_manager
+
+
+@pytest.fixture
+def complaints_file(tmp_path, monkeypatch):
+    """Point the complaint log and its counter at a temp directory."""
+    path = tmp_path / "complaints.jsonl"
+    monkeypatch.setattr(
+        complaint_manager, "_get_complaints_file_path", lambda: str(path)
+    )
+    return path
+
+
+def test_sequence_starts_at_one_without_a_log(complaints_file) -> None:
+    assert complaint_manager._next_complaint_seq() == 1
+
+
+def test_sequence_is_seeded_from_existing_log(complaints_file) -> None:
+    complaints_file.write_text(
+        '{"complaint_number": "A"}\n\n{"complaint_number": "B"}\n{"complaint_number": "C"}\n'
+    )
+
+    assert complaint_manager._next_complaint_seq() == 4
+
+
+def test_sequence_increments_across_calls(complaints_file) -> None:
+    complaints_file.write_text('{"complaint_number": "A"}\n')
+
+    seqs = [complaint_manager._next_complaint_seq() for _ in range(3)]
+
+    assert seqs == [2, 3, 4]
+
+
+def test_sequence_uses_counter_once_seeded(complaints_file) -> None:
+    complaint_manager._next_complaint_seq()
+    # Records appended after seeding don't shift the counter
+    complaints_file.write_text('{"a": 1}\n{"a": 2}\n{"a": 3}\n')
+
+    assert complaint_manager._next_complaint_seq() == 2
+
+
+def test_append_writes_one_json_line_per_record(complaints_file) -> None:
+    first = {"complaint_number": "KYC202601010001", "customer_name": "Aarav Sharma"}
+    second = {"complaint_number": "KYC202601010002", "subject": "Line\nbreak"}
+
+    complaint_manager._append_complaint(first)
+    complaint_manager._append_complaint(second)
+
+    lines = complaints_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [first, second]
+
+
+async def test_create_complaint_numbers_from_sequence(complaints_file) -> None:
+    output = await complaint_manager.create_complaint_tool(
+        opus_id="12345",
+        customer_name="Aarav Sharma",
+        complaint_type="high_priority",
+        subject="KYC Account Approval Delay",
+        issue_description="Approval pending",
+        priority="high",
+    )
+
+    result = json.loads(output)
+    assert result["success"] is True
+    assert result["complaint_number"].endswith("0001")
+    record = json.loads(complaints_file.read_text(encoding="utf-8"))
+    assert record["complaint_number"] == result["complaint_number"]
+    assert record["timeline_days"] == 3
@@ -0,0 +1,95 @@
+import pytest
+
+from tools import customer_data
+
+
+def _row(
+    opus_id: str, mobile: str, first_name: str = "Aarav", data_created: str = "12"
+) -> str:
+    return f"1,{opus_id},{first_name},Sharma,{mobile},a@example.com,Y,F,true,true,false,true,{data_created}\n"
+
+
+def test_parses_record_fields(customer_csv) -> None:
+    customer_csv(_row("OP1", "98123-45670"))
+
+    record = customer_data._record_for_opus_id("OP1")
+
+    assert record.mobile_digits == "9812345670"
+    assert record.name == "Aarav Sharma"
+    assert record.document_flags == (True, True, False, True)
+    assert record.data_created_days == 12
+
+
+def test_phone_lookup_returns_every_account(customer_csv) -> None:
+    customer_csv(
+        _row("OP1", "9812345670"), _row("OP2", "9812345670"), _row("OP3", "9812345671")
+    )
+
+    records = customer_data._records_for_phone("9812345670")
+
+    assert [r.opus_id for r in records] == ["OP1", "OP2"]
+    assert customer_data._records_for_phone("9999999999") == []
+
+
+def test_opus_id_lookup_is_case_insensitive(customer_csv) -> None:
+    customer_csv(_row("ab12", "9812345670"))
+
+    assert customer_data._record_for_opus_id("AB12").opus_id == "ab12"
+    assert customer_data._record_for_opus_id("zz99") is None
+
+
+def test_duplicate_opus_id_first_row_wins(customer_csv) -> None:
+    customer_csv(
+        _row("OP1", "9812345670", first_name="First"),
+        _row("op1", "9812345671", first_name="Second"),
+    )
+
+    assert customer_data._record_for_opus_id("OP1").first_name == "First"
+
+
+def test_index_reloads_when_mtime_changes(customer_csv) -> None:
+    customer_csv(_row("OP1", "9812345670"))
+    assert customer_data._record_for_opus_id("OP2") is None
+
+    customer_csv(_row("OP2", "9812345670"))
+
+    assert customer_data._record_for_opus_id("OP2") is not None
+    assert customer_data._record_for_opus_id("OP1") is None
+
+
+def test_malformed_row_does_not_break_the_index(customer_csv) -> None:
+    customer_csv(
+        _row("OP1", "9812345670", data_created="abc"), _row("OP2", "9812345671")
+    )
+
+    bad = customer_data._record_for_opus_id("OP1")
+
+    assert bad.data_created_days is None
+    assert bad.account_summary()["data_created"] == ""
+    assert [r.opus_id for r in customer_data._records_for_phone("9812345670")] == [
+        "OP1"
+    ]
+    assert customer_data._record_for_opus_id("OP2").data_created_days == 12
+
+
+def test_blank_data_created_is_not_treated_as_new(customer_csv) -> None:
+    customer_csv(_row("OP1", "9812345670", data_created=""))
+
+    assert customer_data._record_for_opus_id("OP1").data_created_days is None
+
+
+def test_short_row_does_not_break_the_index(customer_csv, caplog) -> None:
+    customer_csv("2,OP1,Diya,Patel,9812345671\n", _row("OP2", "9812345670"))
+
+    short = customer_data._record_for_opus_id("OP1")
+
+    assert short.mobile_digits == "9812345671"
+    assert short.document_flags == (False, False, False, False)
+    assert short.data_created_days is None
+    assert customer_data._record_for_opus_id("OP2") is not None
+    assert "missing cells" in caplog.text
+
+
+def test_missing_file_raises_file_not_found(customer_csv) -> None:
+    with pytest.raises(FileNotFoundError):
+        customer_data._records_for_phone("9812345670")
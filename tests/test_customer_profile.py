@@ -0,0 +1,184 @@
+import json
+from types import SimpleNamespace
+
+from tools import customer_lookup, customer_profile, kyc_status_checker
+from tools.hardcoded_context import _CALLER_PHONE
+
+
+class _SpeechHandle:
+    """Stand-in for the turn's SpeechHandle; only needs to be weak-referenceable."""
+
+
+def _context(handle=None) -> SimpleNamespace:
+    """Fake RunContext recording what the tool speaks."""
+    spoken = []
+    session = SimpleNamespace(say=lambda text, **kwargs: spoken.append(text))
+    return SimpleNamespace(
+        speech_handle=handle or _SpeechHandle(), session=session, spoken=spoken
+    )
+
+
+def _row(opus_id: str, mobile: str, kyc_status: str = "F", days: str = "12") -> str:
+    return f"1,{opus_id},Aarav,Sharma,{mobile},a@example.com,Y,{kyc_status},true,false,true,true,{days}\n"
+
+
+def _count_calls(monkeypatch, module, name: str) -> list:
+    """Wrap module.name so each call is recorded."""
+    calls = []
+    original = getattr(module, name)
+
+    def wrapper(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(module, name, wrapper)
+    return calls
+
+
+async def test_full_profile_single_account(customer_csv) -> None:
+    customer_csv(_row("OP1", "9812345670"))
+    context = _context()
+
+    result = json.loads(
+        await customer_profile.customer_full_profile_tool(context, "98123 45670")
+    )
+
+    assert result["success"] is True
+    assert result["multiple_accounts"] is False
+    (account,) = result["accounts"]
+    assert account["opus_id"] == "OP1"
+    assert account["recommendation"] == "within_timeline"
+    assert account["documents_status"]["pan"] is False
+    # KYC fields are merged in once, not repeated from a nested report
+    assert "kyc" not in account
+    assert "customer_name" not in account
+    assert context.spoken == [customer_profile._PROCESSING_FILLER]
+
+
+async def test_full_profile_multiple_accounts(customer_csv) -> None:
+    customer_csv(
+        _row("OP1", "9812345670", kyc_status="F"),
+        _row("OP2", "9812345670", kyc_status="R"),
+    )
+
+    result = json.loads(
+        await customer_profile.customer_full_profile_tool(_context(), "9812345670")
+    )
+
+    assert result["multiple_accounts"] is True
+    assert [(a["opus_id"], a["recommendation"]) for a in result["accounts"]] == [
+        ("OP1", "within_timeline"),
+        ("OP2", "kyc_rejected"),
+    ]
+
+
+async def test_full_profile_not_found(customer_csv) -> None:
+    customer_csv(_row("OP1", "9812345670"))
+
+    result = json.loads(
+        await customer_profile.customer_full_profile_tool(_context(), "9999999999")
+    )
+
+    assert result["success"] is False
+    assert result["error"].startswith("PHONE_LOOKUP_FAILED")
+
+
+async def test_full_profile_rejects_invalid_number(customer_csv) -> None:
+    context = _context()
+
+    result = json.loads(
+        await customer_profile.customer_full_profile_tool(context, "12345")
+    )
+
+    assert result["success"] is False
+    assert context.spoken == []
+
+
+async def test_full_profile_missing_file(customer_csv) -> None:
+    result = json.loads(
+        await customer_profile.customer_full_profile_tool(_context(), "9812345670")
+    )
+
+    assert result["success"] is False
+    assert result["error"].startswith("An error occurred during customer lookup")
+
+
+async def test_identify_caller_uses_registered_number(customer_csv) -> None:
+    customer_csv(_row("OP1", _CALLER_PHONE, kyc_status="P"))
+
+    result = json.loads(await customer_profile.identify_caller_tool(_context()))
+
+    assert result["success"] is True
+    assert result["caller_phone"] == _CALLER_PHONE
+    assert result["accounts"][0]["recommendation"] == "partial_kyc"
+
+
+async def test_identify_caller_not_found(customer_csv) -> None:
+    customer_csv(_row("OP1", "9812345670"))
+
+    result = json.loads(await customer_profile.identify_caller_tool(_context()))
+
+    assert result["success"] is False
+    assert result["caller_phone"] == _CALLER_PHONE
+    assert result["error"].startswith("PHONE_LOOKUP_FAILED")
+
+
+async def test_identify_and_check_kyc_single_match(customer_csv) -> None:
+    customer_csv(_row("OP1", "9812345670", kyc_status="N"))
+
+    result = json.loads(
+        await customer_profile.identify_and_check_kyc_tool(_context(), "OP1")
+    )
+
+    assert result["success"] is True
+    assert result["account"]["opus_id"] == "OP1"
+    assert result["account"]["recommendation"] == "kyc_not_started"
+
+
+async def test_identify_and_check_kyc_not_found(customer_csv) -> None:
+    customer_csv(_row("OP1", "9812345670"))
+
+    result = json.loads(
+        await customer_profile.identify_and_check_kyc_tool(_context(), "OP9")
+    )
+
+    assert result == {"success": False, "error": "No account found for Opus ID OP9."}
+
+
+async def test_identify_and_check_kyc_missing_file(customer_csv) -> None:
+    result = json.loads(
+        await customer_profile.identify_and_check_kyc_tool(_context(), "OP1")
+    )
+
+    assert result["success"] is False
+
+
+async def test_same_turn_reuses_coalesced_lookups(customer_csv, monkeypatch) -> None:
+    customer_csv(_row("OP1", "9812345670"))
+    lookups = _count_calls(monkeypatch, customer_profile, "_find_customers")
+    kyc_checks = _count_calls(monkeypatch, kyc_status_checker, "_record_for_opus_id")
+    handle = _SpeechHandle()
+
+    first = await customer_profile.customer_full_profile_tool(
+        _context(handle), "9812345670"
+    )
+    second = await customer_profile.customer_full_profile_tool(
+        _context(handle), "9812345670"
+    )
+    # The standalone tools share the same per-turn keys
+    await customer_lookup.customer_lookup_tool(_context(handle), "9812345670")
+    await kyc_status_checker.kyc_status_checker_tool(_context(handle), "OP1")
+
+    assert first == second
+    assert len(lookups) == 1
+    assert len(kyc_checks) == 1
+
+
+async def test_new_turn_looks_up_again(customer_csv, monkeypatch) -> None:
+    customer_csv(_row("OP1", "9812345670"))
+    lookups = _count_calls(monkeypatch, customer_profile, "_find_customers")
+
+    await customer_profile.customer_full_profile_tool(_context(), "9812345670")
+    await customer_profile.customer_full_profile_tool(_context(), "9812345670")
+
+    assert len(lookups) == 2
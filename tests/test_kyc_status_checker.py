@@ -0,0 +1,142 @@
+import pytest
+
+from tools import kyc_status_checker
+from tools.customer_data import CustomerRecord
+
+
+def _record(
+    kyc_status: str, days: int, flags=(True, True, True, True)
+) -> CustomerRecord:
+    aadhar, pan, bank, upi = flags
+    return CustomerRecord(
+        opus_id="12345",
+        mobile_digits="9812345670",
+        first_name="Aarav",
+        last_name="Sharma",
+        email="aarav.s@example.com",
+        account_status="Y",
+        kyc_status=kyc_status,
+        is_aadhar_added=aadhar,
+        is_pan_added=pan,
+        is_bank_added=bank,
+        is_upi_added=upi,
+        data_created_days=days,
+    )
+
+
+async def _check(monkeypatch, record) -> dict:
+    monkeypatch.setattr(
+        kyc_status_checker, "_record_for_opus_id", lambda opus_id: record
+    )
+    return await kyc_status_checker._check_kyc_status("12345")
+
+
+# Expected values are the ones the original if/elif chain produced
+@pytest.mark.parametrize(
+    ("record", "recommendation", "message"),
+    [
+        (
+            _record("F", 12),
+            "within_timeline",
+            "KYC is done dont you need to wait 18 days",
+        ),
+        (
+            _record("F", 30),
+            "within_timeline",
+            "KYC is done dont you need to wait 0 days",
+        ),
+        (
+            _record("F", 31),
+            "timeline_exceeded",
+            "KYC completion 30 days passed. Contact TSM or raise a complaint.",
+        ),
+        (
+            _record("P", 5, flags=(True, False, False, True)),
+            "partial_kyc",
+            "KYC is not complete. Please complete PAN, Bank Details",
+        ),
+        (
+            _record("P", 5, flags=(False, False, False, False)),
+            "partial_kyc",
+            "KYC is not complete. Please complete Aadhar, PAN, Bank Details, UPI",
+        ),
+        (
+            _record("R", 5),
+            "kyc_rejected",
+            "KYC is rejected. Please submit documents again.",
+        ),
+        (
+            _record("N", 5),
+            "kyc_not_started",
+            "KYC is not started. Please complete KYC process.",
+        ),
+        (
+            _record("X", 5),
+            "unknown_status",
+            "KYC status unclear. Please check with technical team.",
+        ),
+    ],
+    ids=[
+        "full-within",
+        "full-day-30",
+        "full-exceeded",
+        "partial",
+        "partial-none",
+        "rejected",
+        "not-started",
+        "unknown",
+    ],
+)
+async def test_recommendation_and_message(
+    monkeypatch, record, recommendation, message
+) -> None:
+    result = await _check(monkeypatch, record)
+
+    assert result["success"] is True
+    assert result["recommendation"] == recommendation
+    assert result["message"] == message
+
+
+async def test_report_fields(monkeypatch) -> None:
+    result = await _check(
+        monkeypatch, _record("F", 40, flags=(True, True, False, True))
+    )
+
+    assert result["kyc_status_description"] == "Full KYC Complete"
+    assert result["documents_status"] == {
+        "aadhar": True,
+        "pan": True,
+        "bank": False,
+        "upi": True,
+    }
+    assert result["timeline_info"]["days_remaining_for_approval"] == 0
+    assert result["timeline_info"]["timeline_exceeded"] is True
+    assert result["customer_name"] == "Aarav Sharma"
+
+
+async def test_unknown_opus_id(monkeypatch) -> None:
+    result = await _check(monkeypatch, None)
+
+    assert result == {
+        "success": False,
+        "error": "No customer found with Opus ID: 12345",
+    }
+
+
+async def test_malformed_registration_age(monkeypatch) -> None:
+    result = await _check(monkeypatch, _record("F", None))
+
+    assert result["success"] is False
+
+
+async def test_opus_id_match_is_case_insensitive(customer_csv) -> None:
+    customer_csv(
+        "1,AB123,Aarav,Sharma,9812345670,a@example.com,Y,R,true,true,true,true,5\n"
+    )
+
+    result = await kyc_status_checker._check_kyc_status("ab123")
+
+    assert result["success"] is True
+    # The report carries the ID as stored, not as the caller spelled it
+    assert result["opus_id"] == "AB123"
+    assert result["recommendation"] == "kyc_rejected"
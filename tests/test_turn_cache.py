@@ -0,0 +1,103 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from tools.turn_cache import _coalesced
+
+
+class _SpeechHandle:
+    """Stand-in for the turn's SpeechHandle; only needs to be weak-referenceable."""
+
+
+def _context(handle: _SpeechHandle) -> SimpleNamespace:
+    return SimpleNamespace(speech_handle=handle)
+
+
+def _counting_factory(calls: list, result="ok", delay: float = 0):
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return result
+
+    return factory
+
+
+async def test_same_turn_shares_one_call() -> None:
+    calls = []
+    context = _context(_SpeechHandle())
+    factory = _counting_factory(calls, delay=0.01)
+
+    results = await asyncio.gather(
+        _coalesced(context, ("kyc", "OP1"), factory),
+        _coalesced(context, ("kyc", "OP1"), factory),
+    )
+    # A later call in the same turn reuses the finished result too
+    results.append(await _coalesced(context, ("kyc", "OP1"), factory))
+
+    assert results == ["ok", "ok", "ok"]
+    assert len(calls) == 1
+
+
+async def test_different_keys_are_not_shared() -> None:
+    calls = []
+    context = _context(_SpeechHandle())
+
+    await _coalesced(context, ("kyc", "OP1"), _counting_factory(calls))
+    await _coalesced(context, ("kyc", "OP2"), _counting_factory(calls))
+
+    assert len(calls) == 2
+
+
+async def test_new_turn_calls_again() -> None:
+    calls = []
+
+    await _coalesced(
+        _context(_SpeechHandle()), ("kyc", "OP1"), _counting_factory(calls)
+    )
+    await _coalesced(
+        _context(_SpeechHandle()), ("kyc", "OP1"), _counting_factory(calls)
+    )
+
+    assert len(calls) == 2
+
+
+async def test_cancelled_awaiter_does_not_cancel_shared_call() -> None:
+    calls = []
+    context = _context(_SpeechHandle())
+    factory = _counting_factory(calls, delay=0.01)
+
+    first = asyncio.create_task(_coalesced(context, ("kyc", "OP1"), factory))
+    second = asyncio.create_task(_coalesced(context, ("kyc", "OP1"), factory))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await second == "ok"
+    assert len(calls) == 1
+
+
+async def test_failure_after_cancelled_awaiter_is_not_logged() -> None:
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda _loop, ctx: unhandled.append(ctx))
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("lookup failed")
+
+    waiter = asyncio.create_task(
+        _coalesced(_context(_SpeechHandle()), ("kyc", "OP1"), failing)
+    )
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    # Let the factory fail, then drop the turn so the future is collected
+    await asyncio.sleep(0.05)
+    gc.collect()
+
+    assert unhandled == []